@@ -3,12 +3,32 @@
 Web interface for PR Summarizer
 """
 
-from flask import Flask, render_template_string, request, jsonify
-from summarize_pr import summarize_pr
+from flask import Flask, Response, request, jsonify, stream_with_context
+from flask.json.provider import JSONProvider
+from summarize_pr import summarize_pr, stream_pr
+import hashlib
 import os
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson, used by jsonify and request.json."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
 
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
+
 HTML_TEMPLATE = """
 <!DOCTYPE html>
 <html>
@@ -127,6 +147,51 @@ HTML_TEMPLATE = """
     </div>
     
     <script>
+        function showError(message) {
+            const div = document.createElement('div');
+            div.className = 'error';
+            div.textContent = message;
+            document.getElementById('error').replaceChildren(div);
+        }
+        
+        // Render a text/event-stream response; each event's data is JSON
+        async function readSummaryStream(response) {
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            const content = document.getElementById('summaryContent');
+            let buffer = '';
+            
+            content.textContent = '';
+            
+            while (true) {
+                const { value, done } = await reader.read();
+                if (done) break;
+                buffer += decoder.decode(value, { stream: true });
+                
+                const events = buffer.split('\n\n');
+                buffer = events.pop();
+                
+                for (const raw of events) {
+                    let event = 'message';
+                    let data = '';
+                    for (const line of raw.split('\n')) {
+                        if (line.startsWith('event: ')) event = line.slice(7);
+                        else if (line.startsWith('data: ')) data += line.slice(6);
+                    }
+                    if (!data) continue;
+                    
+                    const payload = JSON.parse(data);
+                    if (event === 'error') {
+                        showError(payload.error);
+                    } else if (payload.chunk) {
+                        content.textContent += payload.chunk;
+                        document.getElementById('summary').style.display = 'block';
+                        document.getElementById('loading').style.display = 'none';
+                    }
+                }
+            }
+        }
+        
         document.getElementById('prForm').addEventListener('submit', async (e) => {
             e.preventDefault();
             
@@ -150,16 +215,20 @@ HTML_TEMPLATE = """
                     body: JSON.stringify({ repo, prNumber: parseInt(prNumber), provider })
                 });
                 
-                const data = await response.json();
-                
-                if (data.error) {
-                    error.innerHTML = `<div class="error">${data.error}</div>`;
+                if ((response.headers.get('Content-Type') || '').startsWith('text/event-stream')) {
+                    await readSummaryStream(response);
                 } else {
-                    document.getElementById('summaryContent').textContent = data.summary;
-                    summary.style.display = 'block';
+                    const data = await response.json();
+                    
+                    if (data.error) {
+                        showError(data.error);
+                    } else {
+                        document.getElementById('summaryContent').textContent = data.summary;
+                        summary.style.display = 'block';
+                    }
                 }
             } catch (err) {
-                error.innerHTML = `<div class="error">Error: ${err.message}</div>`;
+                showError(`Error: ${err.message}`);
             } finally {
                 loading.style.display = 'none';
             }
@@ -169,9 +238,33 @@ HTML_TEMPLATE = """
 </html>
 """
 
+# The page has no template variables, so serve it as fixed bytes
+_INDEX_BYTES = HTML_TEMPLATE.encode("utf-8")
+_INDEX_ETAG = hashlib.md5(_INDEX_BYTES).hexdigest()
+
 @app.route("/")
 def index():
-    return render_template_string(HTML_TEMPLATE)
+    response = Response(
+        _INDEX_BYTES,
+        mimetype="text/html",
+        headers={"Cache-Control": "public, max-age=3600"}
+    )
+    response.set_etag(_INDEX_ETAG)
+    # Answers If-None-Match with a 304
+    return response.make_conditional(request)
+
+def _sse_event(payload, event=None):
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {app.json.dumps(payload)}\n\n"
+
+def _sse_events(chunks):
+    try:
+        for chunk in chunks:
+            yield _sse_event({"chunk": chunk})
+    except Exception as e:
+        yield _sse_event({"error": str(e)}, event="error")
+        return
+    yield _sse_event({}, event="done")
 
 @app.route("/summarize", methods=["POST"])
 def summarize():
@@ -184,11 +277,20 @@ def summarize():
         if not repo or not pr_number:
             return jsonify({"error": "Repository and PR number are required"}), 400
         
-        kwargs = {}
+        kwargs = {"cache": os.getenv("SUMMARY_CACHE", "").lower() in ("1", "true")}
         if provider == "ollama":
             kwargs["base_url"] = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
             kwargs["model"] = os.getenv("OLLAMA_MODEL", "llama2")
         
+        # LLM providers stream tokens to the browser as they are generated
+        if provider in ("openai", "ollama"):
+            chunks = stream_pr(repo, pr_number, provider=provider, **kwargs)
+            return Response(
+                stream_with_context(_sse_events(chunks)),
+                mimetype="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+            )
+        
         summary = summarize_pr(repo, pr_number, provider=provider, **kwargs)
         
         return jsonify({"summary": summary})
@@ -196,4 +298,5 @@ def summarize():
         return jsonify({"error": str(e)}), 500
 
 if __name__ == "__main__":
+    # Development server only; see the README for running under gunicorn
     app.run(debug=True, port=5002)
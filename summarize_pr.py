@@ -7,15 +7,17 @@ Automatically generates TL;DR summaries of GitHub Pull Requests.
 
 import os
 import re
+import json
+import time
+import heapq
+import hashlib
+import functools
 import argparse
-from typing import Dict, List, Optional, Tuple
-from pathlib import Path
-
-try:
-    from github import Github
-    GITHUB_AVAILABLE = True
-except ImportError:
-    GITHUB_AVAILABLE = False
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
 
 try:
     from openai import OpenAI
@@ -25,10 +27,36 @@ except ImportError:
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
     REQUESTS_AVAILABLE = True
 except ImportError:
     REQUESTS_AVAILABLE = False
 
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+
 try:
     from dotenv import load_dotenv
     load_dotenv()
@@ -36,84 +64,437 @@ except ImportError:
     pass
 
 
+# Payloads from GitHub and Ollama can be large; orjson parses them much faster
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+GITHUB_API_URL = "https://api.github.com"
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+
+# Everything get_pr_data needs in one round-trip; REST would take 1 + N pages
+_PR_GRAPHQL_QUERY = """
+query($owner: String!, $name: String!, $number: Int!) {
+  repository(owner: $owner, name: $name) {
+    pullRequest(number: $number) {
+      title
+      body
+      state
+      createdAt
+      updatedAt
+      additions
+      deletions
+      changedFiles
+      baseRefName
+      headRefName
+      headRefOid
+      author { login }
+      files(first: 100) {
+        pageInfo { hasNextPage }
+        nodes { path additions deletions changeType }
+      }
+      commits(first: 100) {
+        pageInfo { hasNextPage }
+        nodes { commit { oid message author { name } } }
+      }
+      labels(first: 100) {
+        pageInfo { hasNextPage }
+        nodes { name }
+      }
+      reviewRequests(first: 100) {
+        pageInfo { hasNextPage }
+        nodes { requestedReviewer { ... on User { login } } }
+      }
+    }
+  }
+}
+"""
+
+# GraphQL PatchStatus -> REST file status
+_CHANGE_TYPES = {
+    "ADDED": "added",
+    "DELETED": "removed",
+    "MODIFIED": "modified",
+    "RENAMED": "renamed",
+    "COPIED": "copied",
+    "CHANGED": "changed"
+}
+
+def _make_session() -> "requests.Session":
+    """Create a pooled session that retries connection failures."""
+    session = requests.Session()
+    # Only retry failures before the request reached the server, so POSTs aren't repeated
+    retry = Retry(total=3, connect=3, read=0, status=0, backoff_factor=0.5)
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Reused across calls so keep-alive connections (and TLS sessions) are shared
+_github_session = _make_session() if REQUESTS_AVAILABLE else None
+_ollama_session = _make_session() if REQUESTS_AVAILABLE else None
+
+# Short-lived cache of fetched PR data, keyed by (repo, pr_number, token).
+# Entries hold (expires_at, etag, data); stale entries are revalidated with a
+# conditional request before paying for a full refetch.
+_PR_CACHE_TTL = 120
+_PR_CACHE_MAXSIZE = 512
+_pr_cache: Dict[Tuple[str, int, str], Tuple[float, Optional[str], Dict]] = {}
+_pr_cache_lock = threading.Lock()
+
+
+def _revalidate_pr(repo_name: str, pr_number: int, github_token: str, etag: Optional[str], updated_at: str) -> Tuple[bool, Optional[str]]:
+    """
+    Check whether a PR changed since it was cached, without refetching files/commits.
+    
+    Returns whether it is unchanged and the ETag to send next time. The GraphQL
+    fetch has no ETag, so the first revalidation of such an entry is a full GET;
+    keeping the ETag it returns makes later revalidations 304s.
+    """
+    if not REQUESTS_AVAILABLE:
+        return False, etag
+    
+    headers = _github_headers(github_token)
+    if etag:
+        headers["If-None-Match"] = etag
+    
+    try:
+        response = _github_session.get(
+            f"{GITHUB_API_URL}/repos/{repo_name}/pulls/{pr_number}",
+            headers=headers,
+            timeout=30
+        )
+    except requests.RequestException:
+        return False, etag
+    
+    # 304s don't count against the rate limit
+    if response.status_code == 304:
+        return True, etag
+    if response.status_code != 200:
+        return False, etag
+    unchanged = _isoformat(_json_loads(response.content).get("updated_at") or "") == updated_at
+    return unchanged, response.headers.get("ETag")
+
+
 def get_pr_data(repo_name: str, pr_number: int, github_token: str) -> Dict:
-    """Fetch PR data from GitHub API."""
-    if not GITHUB_AVAILABLE:
-        raise ImportError("PyGithub not installed. Install with: pip install PyGithub")
+    """Fetch PR data from GitHub API, reusing recently fetched data when unchanged."""
+    key = (repo_name, pr_number, github_token)
+    with _pr_cache_lock:
+        entry = _pr_cache.get(key)
+    
+    if entry:
+        expires_at, etag, data = entry
+        unchanged = time.monotonic() < expires_at
+        if not unchanged:
+            unchanged, etag = _revalidate_pr(repo_name, pr_number, github_token, etag, data["updated_at"])
+        if unchanged:
+            with _pr_cache_lock:
+                _pr_cache[key] = (time.monotonic() + _PR_CACHE_TTL, etag, data)
+            return data
+    
+    data, etag = _fetch_pr_data(repo_name, pr_number, github_token)
+    with _pr_cache_lock:
+        _pr_cache.pop(key, None)
+        while len(_pr_cache) >= _PR_CACHE_MAXSIZE:
+            _pr_cache.pop(next(iter(_pr_cache)))
+        _pr_cache[key] = (time.monotonic() + _PR_CACHE_TTL, etag, data)
+    return data
+
+
+def _fetch_pr_data(repo_name: str, pr_number: int, github_token: str) -> Tuple[Dict, Optional[str]]:
+    """Fetch PR data from GitHub API. Returns the data and the PR's ETag, if known."""
+    if not REQUESTS_AVAILABLE:
+        raise ImportError("requests package not installed. Install with: pip install requests")
+    
+    data = _fetch_pr_graphql(repo_name, pr_number, github_token)
+    if data is not None:
+        return data, None
+    
+    return _fetch_pr_rest(repo_name, pr_number, github_token)
+
+
+def _fetch_pr_graphql(repo_name: str, pr_number: int, github_token: str) -> Optional[Dict]:
+    """
+    Fetch PR data with a single GraphQL query.
+    
+    Returns None if the request fails (network error, non-200 status or a body
+    that isn't JSON), the query returns errors, or the PR has more files,
+    commits, labels or review requests than one page holds, so the caller can
+    fall back to REST.
+    """
+    owner, _, name = repo_name.partition("/")
+    try:
+        response = _github_session.post(
+            GITHUB_GRAPHQL_URL,
+            json={
+                "query": _PR_GRAPHQL_QUERY,
+                "variables": {"owner": owner, "name": name, "number": pr_number}
+            },
+            headers={"Authorization": f"bearer {github_token}"},
+            timeout=30
+        )
+    except requests.RequestException:
+        return None
+    # Rate limits, 5xx and tokens GraphQL rejects all get a chance over REST
+    if response.status_code != 200:
+        return None
+    
+    # Both json and orjson decode errors are ValueErrors
+    try:
+        result = _json_loads(response.content)
+    except ValueError:
+        return None
+    if not isinstance(result, dict):
+        return None
+    pr = ((result.get("data") or {}).get("repository") or {}).get("pullRequest")
+    if result.get("errors") or not pr:
+        return None
+    if any(pr[field]["pageInfo"]["hasNextPage"] for field in ("files", "commits", "labels", "reviewRequests")):
+        return None
+    
+    files = []
+    for file in pr["files"]["nodes"]:
+        files.append({
+            "filename": file["path"],
+            "filename_lower": file["path"].lower(),
+            "ext": _file_extension(file["path"]),
+            "status": _CHANGE_TYPES.get(file["changeType"], file["changeType"].lower()),
+            "additions": file["additions"],
+            "deletions": file["deletions"]
+        })
+    
+    commits = []
+    for node in pr["commits"]["nodes"]:
+        commit = node["commit"]
+        commits.append({
+            "sha": commit["oid"][:7],
+            "message": commit["message"].partition("\n")[0],
+            "author": (commit["author"] or {}).get("name")
+        })
+    
+    reviewers = []
+    for request in pr["reviewRequests"]["nodes"]:
+        # Team review requests come back as empty objects
+        login = (request["requestedReviewer"] or {}).get("login")
+        if login:
+            reviewers.append(login)
+    
+    return {
+        "title": pr["title"],
+        "body": pr["body"] or "",
+        "author": (pr["author"] or {}).get("login", "ghost"),
+        "state": "open" if pr["state"] == "OPEN" else "closed",
+        "created_at": _isoformat(pr["createdAt"]),
+        "updated_at": _isoformat(pr["updatedAt"]),
+        "files": files,
+        "commits": commits,
+        "additions": pr["additions"],
+        "deletions": pr["deletions"],
+        "changed_files": pr["changedFiles"],
+        "base_branch": pr["baseRefName"],
+        "head_branch": pr["headRefName"],
+        "head_sha": pr["headRefOid"],
+        "labels": [label["name"] for label in pr["labels"]["nodes"]],
+        "reviewers": reviewers
+    }
+
+
+def _file_extension(filename: str) -> str:
+    """File extension including the dot, or "" if there is none (same rules as Path.suffix)."""
+    name = filename[filename.rfind("/") + 1:]
+    dot = name.rfind(".")
+    return name[dot:] if 0 < dot < len(name) - 1 else ""
+
+
+def _filename_lower(file: Dict) -> str:
+    """Lowercased filename, precomputed by get_pr_data when available."""
+    return file.get("filename_lower") or file["filename"].lower()
+
+
+def _file_ext(file: Dict) -> str:
+    """File extension, precomputed by get_pr_data when available."""
+    return file["ext"] if "ext" in file else _file_extension(file["filename"])
+
+
+def _isoformat(timestamp: str) -> str:
+    """Normalize a GitHub "...Z" timestamp to datetime.isoformat() style."""
+    return timestamp.replace("Z", "+00:00")
+
+
+def _fetch_pr_rest(repo_name: str, pr_number: int, github_token: str) -> Tuple[Dict, Optional[str]]:
+    """Fetch PR data from the GitHub REST API. Returns the data and the PR's ETag."""
+    pr_path = f"/repos/{repo_name}/pulls/{pr_number}"
+    
+    # The PR, its files and its commits are independent; fetch them concurrently
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        pr_future = executor.submit(_github_get, pr_path, github_token)
+        files_future = executor.submit(_github_get, f"{pr_path}/files", github_token, {"per_page": 100})
+        commits_future = executor.submit(_github_get, f"{pr_path}/commits", github_token, {"per_page": 100})
+        
+        raw_files = _get_remaining_pages(executor, files_future.result(), f"{pr_path}/files", github_token)
+        raw_commits = _get_remaining_pages(executor, commits_future.result(), f"{pr_path}/commits", github_token)
+        pr_response = pr_future.result()
     
-    g = Github(github_token)
-    repo = g.get_repo(repo_name)
-    pr = repo.get_pull(pr_number)
+    pr = _json_loads(pr_response.content)
     
     # Get files changed
     files = []
-    for file in pr.get_files():
+    for file in raw_files:
         files.append({
-            "filename": file.filename,
-            "status": file.status,
-            "additions": file.additions,
-            "deletions": file.deletions,
-            "patch": file.patch[:500] if file.patch else None  # Limit patch size
+            "filename": file["filename"],
+            "filename_lower": file["filename"].lower(),
+            "ext": _file_extension(file["filename"]),
+            "status": file["status"],
+            "additions": file["additions"],
+            "deletions": file["deletions"]
         })
     
     # Get commits
     commits = []
-    for commit in pr.get_commits():
+    for commit in raw_commits:
         commits.append({
-            "sha": commit.sha[:7],
-            "message": commit.commit.message.split("\n")[0],
-            "author": commit.commit.author.name
+            "sha": commit["sha"][:7],
+            "message": commit["commit"]["message"].partition("\n")[0],
+            "author": commit["commit"]["author"]["name"]
         })
     
-    return {
-        "title": pr.title,
-        "body": pr.body or "",
-        "author": pr.user.login,
-        "state": pr.state,
-        "created_at": pr.created_at.isoformat(),
+    data = {
+        "title": pr["title"],
+        "body": pr["body"] or "",
+        "author": pr["user"]["login"],
+        "state": pr["state"],
+        "created_at": _isoformat(pr["created_at"]),
+        "updated_at": _isoformat(pr["updated_at"]),
         "files": files,
         "commits": commits,
-        "additions": pr.additions,
-        "deletions": pr.deletions,
-        "changed_files": pr.changed_files,
-        "base_branch": pr.base.ref,
-        "head_branch": pr.head.ref,
-        "labels": [label.name for label in pr.labels],
-        "reviewers": [r.login for r in pr.requested_reviewers]
+        "additions": pr["additions"],
+        "deletions": pr["deletions"],
+        "changed_files": pr["changed_files"],
+        "base_branch": pr["base"]["ref"],
+        "head_branch": pr["head"]["ref"],
+        "head_sha": pr["head"]["sha"],
+        "labels": [label["name"] for label in pr["labels"]],
+        "reviewers": [r["login"] for r in pr["requested_reviewers"]]
+    }
+    
+    return data, pr_response.headers.get("ETag")
+
+
+def _github_headers(github_token: str) -> Dict[str, str]:
+    return {
+        "Authorization": f"token {github_token}",
+        "Accept": "application/vnd.github+json"
     }
 
 
+def _github_get(path: str, github_token: str, params: Optional[Dict] = None) -> "requests.Response":
+    """GET a GitHub REST endpoint, raising on HTTP errors."""
+    response = _github_session.get(
+        f"{GITHUB_API_URL}{path}",
+        headers=_github_headers(github_token),
+        params=params,
+        timeout=30
+    )
+    response.raise_for_status()
+    return response
+
+
+def _get_remaining_pages(executor: ThreadPoolExecutor, first_page: "requests.Response", path: str, github_token: str) -> List[Dict]:
+    """Collect every page of a paginated listing, fetching pages 2..N concurrently."""
+    items = _json_loads(first_page.content)
+    
+    last_url = first_page.links.get("last", {}).get("url")
+    if not last_url:
+        return items
+    
+    last_page = int(parse_qs(urlparse(last_url).query)["page"][0])
+    pages = executor.map(
+        lambda page: _json_loads(_github_get(path, github_token, {"per_page": 100, "page": page}).content),
+        range(2, last_page + 1)
+    )
+    for page in pages:
+        items.extend(page)
+    return items
+
+
+HIGH_RISK_KEYWORDS = (
+    "auth", "authentication", "security", "password", "token", "credential",
+    "payment", "billing", "charge", "transaction",
+    "database", "migration", "schema", "sql",
+    "config", "environment", "secret", "key"
+)
+
+MEDIUM_RISK_KEYWORDS = (
+    "api", "endpoint", "route", "controller",
+    "deploy", "infrastructure", "docker", "kubernetes",
+    "test", "testing", "spec"
+)
+
+CRITICAL_EXT_SET = frozenset({".py", ".js", ".ts", ".java", ".go", ".rb"})
+
+
+def _build_risk_automaton():
+    """Build an Aho-Corasick automaton matching every risk keyword in one pass."""
+    automaton = ahocorasick.Automaton()
+    for level, keywords in (("high", HIGH_RISK_KEYWORDS), ("medium", MEDIUM_RISK_KEYWORDS)):
+        for keyword in keywords:
+            automaton.add_word(keyword, (level, keyword))
+    automaton.make_automaton()
+    return automaton
+
+
+_risk_automaton = _build_risk_automaton() if AHOCORASICK_AVAILABLE else None
+
+
+def _scan_risk_keywords(content: str) -> Tuple[Optional[str], set]:
+    """
+    Scan content for risk keywords, stopping at the first high-risk one.
+    
+    Returns the high-risk keyword that ends earliest in content (the longest one
+    on a tie), or None, and the distinct medium-risk keywords seen. The medium
+    set is only complete when no high-risk keyword was found.
+    """
+    medium = set()
+    if _risk_automaton is not None:
+        first = None
+        # Matches come in end-position order; finish the position of the first hit
+        for end, (level, keyword) in _risk_automaton.iter(content):
+            if first is not None and end != first[0]:
+                break
+            if level == "high":
+                if first is None or len(keyword) > len(first[1]):
+                    first = (end, keyword)
+            else:
+                medium.add(keyword)
+        if first is not None:
+            return first[1], medium
+    else:
+        hits = [
+            (content.find(keyword) + len(keyword), -len(keyword), keyword)
+            for keyword in HIGH_RISK_KEYWORDS if keyword in content
+        ]
+        if hits:
+            return min(hits)[2], medium
+        medium.update(k for k in MEDIUM_RISK_KEYWORDS if k in content)
+    return None, medium
+
+
 def assess_risk_level(files: List[Dict], title: str, body: str) -> Tuple[str, str]:
     """Assess risk level based on files changed and PR content."""
-    high_risk_keywords = [
-        "auth", "authentication", "security", "password", "token", "credential",
-        "payment", "billing", "charge", "transaction",
-        "database", "migration", "schema", "sql",
-        "config", "environment", "secret", "key"
-    ]
-    
-    medium_risk_keywords = [
-        "api", "endpoint", "route", "controller",
-        "deploy", "infrastructure", "docker", "kubernetes",
-        "test", "testing", "spec"
-    ]
-    
     content = (title + " " + body).lower()
-    filenames = " ".join([f["filename"].lower() for f in files])
-    all_content = content + " " + filenames
+    all_content = content + " " + _joined_filenames(files)
     
-    # Check for high-risk indicators
-    high_risk_count = sum(1 for keyword in high_risk_keywords if keyword in all_content)
-    medium_risk_count = sum(1 for keyword in medium_risk_keywords if keyword in all_content)
+    # Any high-risk indicator alone makes the PR high risk
+    high_risk_keyword, medium_risk_keywords = _scan_risk_keywords(all_content)
+    if high_risk_keyword:
+        return "High", f"High-risk keyword: {high_risk_keyword}"
     
     # Check file types
-    critical_extensions = [".py", ".js", ".ts", ".java", ".go", ".rb"]
-    critical_files = sum(1 for f in files if any(f["filename"].endswith(ext) for ext in critical_extensions))
+    critical_files = sum(1 for f in files if _file_ext(f) in CRITICAL_EXT_SET)
+    if critical_files > 10:
+        return "High", f"Touches {critical_files} critical files"
     
-    if high_risk_count > 0 or critical_files > 10:
-        risk_level = "High"
-        reasoning = f"Touches {high_risk_count} high-risk areas or {critical_files} critical files"
-    elif medium_risk_count > 2 or critical_files > 5:
+    medium_risk_count = len(medium_risk_keywords)
+    if medium_risk_count > 2 or critical_files > 5:
         risk_level = "Medium"
         reasoning = f"Moderate changes affecting {medium_risk_count} areas"
     else:
@@ -123,6 +504,21 @@ def assess_risk_level(files: List[Dict], title: str, body: str) -> Tuple[str, st
     return risk_level, reasoning
 
 
+_SECURITY_TEAM, _QA_TEAM, _FRONTEND_TEAM, _BACKEND_TEAM = 1, 2, 4, 8
+_ALL_TEAMS = _SECURITY_TEAM | _QA_TEAM | _FRONTEND_TEAM | _BACKEND_TEAM
+_REVIEWER_TEAMS = (
+    (_SECURITY_TEAM, "security-team"),
+    (_QA_TEAM, "qa-team"),
+    (_FRONTEND_TEAM, "frontend-team"),
+    (_BACKEND_TEAM, "backend-team")
+)
+
+
+def _joined_filenames(files: List[Dict]) -> str:
+    """Lowercased filenames in one NUL-separated string, so matches can't span files."""
+    return "\x00".join([_filename_lower(f) for f in files])
+
+
 def suggest_reviewers(files: List[Dict], repo_name: str, github_token: str) -> List[str]:
     """Suggest reviewers based on file ownership (CODEOWNERS or git blame)."""
     # This is a simplified version - in production, you'd check CODEOWNERS file
@@ -136,58 +532,38 @@ def suggest_reviewers(files: List[Dict], repo_name: str, github_token: str) -> L
             directories[dir_path] = directories.get(dir_path, 0) + 1
     
     # Simple heuristic: suggest based on file paths
-    suggestions = []
-    
-    # Check for common patterns
-    if any("auth" in f["filename"].lower() or "security" in f["filename"].lower() for f in files):
-        suggestions.append("security-team")
-    
-    if any("test" in f["filename"].lower() for f in files):
-        suggestions.append("qa-team")
+    # Check for common patterns in a single pass, stopping once every team matched
+    matched = 0
+    for f in files:
+        name = _filename_lower(f)
+        if "auth" in name or "security" in name:
+            matched |= _SECURITY_TEAM
+        if "test" in name:
+            matched |= _QA_TEAM
+        if "frontend" in name or "ui" in name:
+            matched |= _FRONTEND_TEAM
+        if "backend" in name or "api" in name:
+            matched |= _BACKEND_TEAM
+        if matched == _ALL_TEAMS:
+            break
     
-    if any("frontend" in f["filename"].lower() or "ui" in f["filename"].lower() for f in files):
-        suggestions.append("frontend-team")
-    
-    if any("backend" in f["filename"].lower() or "api" in f["filename"].lower() for f in files):
-        suggestions.append("backend-team")
+    suggestions = [team for flag, team in _REVIEWER_TEAMS if matched & flag]
     
     return suggestions[:3]  # Limit to 3 suggestions
 
 
-def summarize_with_openai(pr_data: Dict, api_key: Optional[str] = None) -> str:
-    """Generate PR summary using OpenAI."""
-    if not OPENAI_AVAILABLE:
-        raise ImportError("openai package not installed. Install with: pip install openai")
-    
-    api_key = api_key or os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise ValueError("OPENAI_API_KEY not found in environment or provided")
-    
-    client = OpenAI(api_key=api_key)
-    
-    # Prepare context
-    files_summary = "\n".join([
-        f"- {f['filename']} ({f['status']}, +{f['additions']}/-{f['deletions']})"
-        for f in pr_data["files"][:20]  # Limit to 20 files
-    ])
-    
-    commits_summary = "\n".join([
-        f"- {c['sha']}: {c['message']}"
-        for c in pr_data["commits"][:10]  # Limit to 10 commits
-    ])
-    
-    prompt = f"""Analyze this GitHub Pull Request and provide a concise summary:
+_PROMPT_TPL = """Analyze this GitHub Pull Request and provide a concise summary:
 
-Title: {pr_data['title']}
-Description: {pr_data['body'][:500]}
-Author: {pr_data['author']}
-Files Changed: {pr_data['changed_files']} files (+{pr_data['additions']}/-{pr_data['deletions']} lines)
+Title: %s
+Description: %s
+Author: %s
+Files Changed: %s files (+%s/-%s lines)
 
 Files:
-{files_summary}
+%s
 
 Commits:
-{commits_summary}
+%s
 
 Provide a structured summary with:
 1. TL;DR (one sentence)
@@ -199,72 +575,194 @@ Provide a structured summary with:
 
 Format as Markdown."""
 
-    try:
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that summarizes GitHub Pull Requests for code review."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3
-        )
-        
-        return response.choices[0].message.content
-    except Exception as e:
-        raise Exception(f"OpenAI API error: {e}")
-
 
-def summarize_with_ollama(pr_data: Dict, base_url: str = "http://localhost:11434", model: str = "llama2") -> str:
-    """Generate PR summary using Ollama."""
-    if not REQUESTS_AVAILABLE:
-        raise ImportError("requests package not installed. Install with: pip install requests")
-    
+def _summarize_changes(pr_data: Dict) -> Tuple[str, str]:
+    """Render the file and commit lists included in LLM prompts."""
     files_summary = "\n".join([
         f"- {f['filename']} ({f['status']}, +{f['additions']}/-{f['deletions']})"
-        for f in pr_data["files"][:20]
+        for f in pr_data["files"][:20]  # Limit to 20 files
     ])
     
     commits_summary = "\n".join([
         f"- {c['sha']}: {c['message']}"
-        for c in pr_data["commits"][:10]
+        for c in pr_data["commits"][:10]  # Limit to 10 commits
     ])
     
-    prompt = f"""Analyze this GitHub Pull Request and provide a concise summary:
+    return files_summary, commits_summary
 
-Title: {pr_data['title']}
-Description: {pr_data['body'][:500]}
-Author: {pr_data['author']}
-Files Changed: {pr_data['changed_files']} files (+{pr_data['additions']}/-{pr_data['deletions']} lines)
 
-Files:
-{files_summary}
+OPENAI_MODEL = "gpt-3.5-turbo"
+_OPENAI_SYSTEM_PROMPT = "You are a helpful assistant that summarizes GitHub Pull Requests for code review."
 
-Commits:
-{commits_summary}
+# Token budgets for the variable parts of the OpenAI prompt. The body budget
+# stays within the old 500-char cut (~4 chars/token for English).
+_BODY_MAX_TOKENS = 125
+_FILES_MAX_TOKENS = 400
+_COMMITS_MAX_TOKENS = 200
 
-Provide a structured summary with:
-1. TL;DR (one sentence)
-2. Files Changed + Purpose (brief description of what each major file does)
-3. Risk Level (Low/Medium/High) with reasoning
-4. Suggested Reviewers (based on file ownership/patterns)
-5. Key Changes (3-5 bullet points)
-6. Testing Notes (what should be tested)
+_openai_encoding = None
 
-Format as Markdown."""
 
+def _get_openai_encoding():
+    """Return the OpenAI model's tiktoken encoding, or None if it can't be loaded."""
+    global _openai_encoding
+    if _openai_encoding is None and TIKTOKEN_AVAILABLE:
+        # Loaded lazily: tiktoken fetches the BPE ranks on first use, which can
+        # fail offline. Failures aren't cached so a later call can retry.
+        try:
+            _openai_encoding = tiktoken.encoding_for_model(OPENAI_MODEL)
+        except Exception:
+            return None
+    return _openai_encoding
+
+
+def _truncate_tokens(encoding, text: str, max_tokens: int) -> str:
+    """Truncate text to at most max_tokens tokens."""
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
+
+
+def _truncate_lines_tokens(encoding, text: str, max_tokens: int) -> str:
+    """Keep as many whole lines of text as fit in max_tokens tokens."""
+    lines = []
+    used = 0
+    for line in text.split("\n"):
+        used += len(encoding.encode(line + "\n", disallowed_special=()))
+        if used > max_tokens:
+            break
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def _build_prompt(pr_data: Dict, fit_to_tokens: bool = False) -> str:
+    """
+    Build the LLM prompt shared by the OpenAI and Ollama providers.
+    
+    With fit_to_tokens, the description and file/commit lists are capped by
+    OpenAI token count rather than characters (when the tiktoken encoding can
+    be loaded; otherwise the character cut applies).
+    """
+    files_summary, commits_summary = _summarize_changes(pr_data)
+    
+    encoding = _get_openai_encoding() if fit_to_tokens else None
+    if encoding is not None:
+        body = _truncate_tokens(encoding, pr_data["body"], _BODY_MAX_TOKENS)
+        files_summary = _truncate_lines_tokens(encoding, files_summary, _FILES_MAX_TOKENS)
+        commits_summary = _truncate_lines_tokens(encoding, commits_summary, _COMMITS_MAX_TOKENS)
+    else:
+        body = pr_data["body"][:500]
+    
+    return _PROMPT_TPL % (
+        pr_data["title"],
+        body,
+        pr_data["author"],
+        pr_data["changed_files"],
+        pr_data["additions"],
+        pr_data["deletions"],
+        files_summary,
+        commits_summary
+    )
+
+
+@functools.lru_cache(maxsize=4)
+def _get_openai_client(api_key: str) -> "OpenAI":
+    """Return a shared OpenAI client per API key, reusing its connection pool."""
+    return OpenAI(api_key=api_key)
+
+
+def summarize_with_openai(pr_data: Dict, api_key: Optional[str] = None, temperature: float = 0.3) -> str:
+    """Generate PR summary using OpenAI."""
+    return "".join(stream_with_openai(pr_data, api_key, temperature))
+
+
+def stream_with_openai(pr_data: Dict, api_key: Optional[str] = None, temperature: float = 0.3) -> Iterator[str]:
+    """Generate PR summary using OpenAI, yielding text as it is produced."""
+    if not OPENAI_AVAILABLE:
+        raise ImportError("openai package not installed. Install with: pip install openai")
+    
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY not found in environment or provided")
+    
+    client = _get_openai_client(api_key)
+    
+    prompt = _build_prompt(pr_data, fit_to_tokens=True)
+
+    # Start the request eagerly so auth/quota errors raise before streaming begins
     try:
-        response = requests.post(
+        stream = client.chat.completions.create(
+            model=OPENAI_MODEL,
+            messages=[
+                {"role": "system", "content": _OPENAI_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=temperature,
+            stream=True
+        )
+    except Exception as e:
+        raise Exception(f"OpenAI API error: {e}")
+    
+    return _iter_openai_chunks(stream)
+
+
+def _iter_openai_chunks(stream) -> Iterator[str]:
+    # Closing releases the connection if the consumer stops early (e.g. client disconnect)
+    try:
+        with stream:
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+    except Exception as e:
+        raise Exception(f"OpenAI API error: {e}")
+
+
+def summarize_with_ollama(pr_data: Dict, base_url: str = "http://localhost:11434", model: str = "llama2") -> str:
+    """Generate PR summary using Ollama."""
+    return "".join(stream_with_ollama(pr_data, base_url, model))
+
+
+def stream_with_ollama(pr_data: Dict, base_url: str = "http://localhost:11434", model: str = "llama2") -> Iterator[str]:
+    """Generate PR summary using Ollama, yielding text as it is produced."""
+    if not REQUESTS_AVAILABLE:
+        raise ImportError("requests package not installed. Install with: pip install requests")
+    
+    prompt = _build_prompt(pr_data)
+
+    # Start the request eagerly so connection/model errors raise before streaming begins
+    try:
+        response = _ollama_session.post(
             f"{base_url}/api/generate",
             json={
                 "model": model,
                 "prompt": prompt,
-                "stream": False
+                "stream": True
             },
+            stream=True,
             timeout=120
         )
         response.raise_for_status()
-        
-        return response.json().get("response", "")
+    except Exception as e:
+        raise Exception(f"Ollama API error: {e}")
+    
+    return _iter_ollama_chunks(response)
+
+
+def _iter_ollama_chunks(response: "requests.Response") -> Iterator[str]:
+    # Ollama streams one JSON object per line
+    try:
+        with response:
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = _json_loads(line)
+                if chunk.get("error"):
+                    raise Exception(chunk["error"])
+                if chunk.get("response"):
+                    yield chunk["response"]
+                if chunk.get("done"):
+                    break
     except Exception as e:
         raise Exception(f"Ollama API error: {e}")
 
@@ -275,12 +773,9 @@ def summarize_with_basic(pr_data: Dict) -> str:
     suggested_reviewers = suggest_reviewers(pr_data["files"], "", "")
     
     # Group files by type
-    file_types = {}
-    for file in pr_data["files"]:
-        ext = Path(file["filename"]).suffix or "no extension"
-        file_types[ext] = file_types.get(ext, 0) + 1
+    file_types = Counter(_file_ext(file) or "no extension" for file in pr_data["files"])
     
-    summary = f"""# PR Summary: {pr_data['title']}
+    parts = [f"""# PR Summary: {pr_data['title']}
 
 ## TL;DR
 {pr_data['title']} by @{pr_data['author']} - {pr_data['changed_files']} files changed (+{pr_data['additions']}/-{pr_data['deletions']} lines)
@@ -288,48 +783,141 @@ def summarize_with_basic(pr_data: Dict) -> str:
 ## Files Changed + Purpose
 - **Total Files**: {pr_data['changed_files']}
 - **Lines Changed**: +{pr_data['additions']} additions, -{pr_data['deletions']} deletions
-- **File Types**: {', '.join(f'{ext}: {count}' for ext, count in sorted(file_types.items(), key=lambda x: x[1], reverse=True)[:5])}
+- **File Types**: {', '.join(f'{ext}: {count}' for ext, count in file_types.most_common(5))}
 
 ### Major Files:
-"""
+"""]
     
     # Show top 10 files by change size
-    sorted_files = sorted(pr_data["files"], key=lambda x: x["additions"] + x["deletions"], reverse=True)
-    for file in sorted_files[:10]:
-        summary += f"- `{file['filename']}` ({file['status']}, +{file['additions']}/-{file['deletions']})\n"
+    for file in heapq.nlargest(10, pr_data["files"], key=lambda x: x["additions"] + x["deletions"]):
+        parts.append(f"- `{file['filename']}` ({file['status']}, +{file['additions']}/-{file['deletions']})\n")
     
-    summary += f"""
+    parts.append(f"""
 ## Risk Level
 **{risk_level}** - {risk_reasoning}
 
 ## Suggested Reviewers
-"""
+""")
     
     if suggested_reviewers:
         for reviewer in suggested_reviewers:
-            summary += f"- @{reviewer}\n"
+            parts.append(f"- @{reviewer}\n")
     else:
-        summary += "- Review based on file ownership\n"
+        parts.append("- Review based on file ownership\n")
     
-    summary += f"""
+    parts.append(f"""
 ## Key Changes
 - {pr_data['changed_files']} files modified
 - {len(pr_data['commits'])} commits
 - Base: `{pr_data['base_branch']}` ← Head: `{pr_data['head_branch']}`
-"""
+""")
     
     if pr_data["labels"]:
-        summary += f"- Labels: {', '.join(pr_data['labels'])}\n"
+        parts.append(f"- Labels: {', '.join(pr_data['labels'])}\n")
     
-    summary += f"""
+    parts.append("""
 ## Testing Notes
 - Review changes in critical files
 - Test affected functionality
 - Verify no breaking changes
 - Check for proper error handling
-"""
+""")
     
-    return summary
+    return "".join(parts)
+
+
+# Finished summaries, keyed by PR head commit so they outlive the PR data cache
+SUMMARY_CACHE_DIR = os.path.expanduser("~/.cache/pr-summarizer/responses")
+SUMMARY_CACHE_TTL = 7 * 24 * 3600
+_SUMMARY_CACHE_MAXSIZE = 512
+_summary_cache = None
+_summary_cache_lock = threading.Lock()
+
+# Basic summaries depend only on PR data and this module's code, so any code
+# change invalidates them
+with open(__file__, "rb") as _source:
+    _CODE_VERSION = hashlib.sha256(_source.read()).hexdigest()
+
+
+def _get_summary_cache():
+    """
+    Return the summary cache: on disk if diskcache is installed and the cache
+    directory is usable, else in memory.
+    """
+    global _summary_cache
+    with _summary_cache_lock:
+        if _summary_cache is None:
+            _summary_cache = {}
+            if DISKCACHE_AVAILABLE:
+                # Caching is best-effort; an unwritable ~/.cache must not break summaries
+                try:
+                    _summary_cache = diskcache.Cache(SUMMARY_CACHE_DIR)
+                except Exception:
+                    pass
+        return _summary_cache
+
+
+def _summary_cache_key(repo_name: str, pr_number: int, provider: str, pr_data: Dict, kwargs: Dict) -> str:
+    """
+    Key a summary by PR identity plus everything that shapes its output.
+    
+    LLM summaries hash the exact prompt sent (so template, truncation and
+    tiktoken changes all invalidate them); basic summaries hash the code version.
+    """
+    parts = [repo_name, str(pr_number), provider, pr_data["head_sha"]]
+    if provider == "openai":
+        # Cached OpenAI summaries always run at temperature 0
+        parts += [OPENAI_MODEL, _OPENAI_SYSTEM_PROMPT, "0", _build_prompt(pr_data, fit_to_tokens=True)]
+    elif provider == "ollama":
+        parts += [
+            kwargs.get("base_url", "http://localhost:11434"),
+            kwargs.get("model", "llama2"),
+            _build_prompt(pr_data)
+        ]
+    else:
+        # updated_at covers title/body/label edits that don't move head_sha
+        parts += [_CODE_VERSION, pr_data["updated_at"]]
+    return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()
+
+
+def _load_summary(key: str) -> Optional[str]:
+    cache = _get_summary_cache()
+    if not isinstance(cache, dict):
+        # diskcache drops expired entries itself; read failures are cache misses
+        try:
+            return cache.get(key)
+        except Exception:
+            return None
+    with _summary_cache_lock:
+        entry = cache.get(key)
+    if entry is None or time.monotonic() >= entry[0]:
+        return None
+    return entry[1]
+
+
+def _store_summary(key: str, summary: str) -> None:
+    cache = _get_summary_cache()
+    if not isinstance(cache, dict):
+        # A failed write only loses the cache entry, never the summary
+        try:
+            cache.set(key, summary, expire=SUMMARY_CACHE_TTL)
+        except Exception:
+            pass
+        return
+    with _summary_cache_lock:
+        cache.pop(key, None)
+        while len(cache) >= _SUMMARY_CACHE_MAXSIZE:
+            cache.pop(next(iter(cache)))
+        cache[key] = (time.monotonic() + SUMMARY_CACHE_TTL, summary)
+
+
+def _cache_completed(chunks: Iterator[str], key: str) -> Iterator[str]:
+    """Pass chunks through, caching the full summary once the stream completes."""
+    parts = []
+    for chunk in chunks:
+        parts.append(chunk)
+        yield chunk
+    _store_summary(key, "".join(parts))
 
 
 def summarize_pr(repo_name: str, pr_number: int, provider: str = "basic", github_token: Optional[str] = None, **kwargs) -> str:
@@ -341,11 +929,24 @@ def summarize_pr(repo_name: str, pr_number: int, provider: str = "basic", github
         pr_number: Pull request number
         provider: "basic", "openai", or "ollama"
         github_token: GitHub personal access token
-        **kwargs: Additional arguments for specific providers
+        **kwargs: Additional arguments for specific providers. Pass cache=True
+            to reuse LLM summaries of unchanged PRs (basic summaries are
+            always cached); OpenAI then runs at temperature 0.
     
     Returns:
         Markdown-formatted PR summary
     """
+    return "".join(stream_pr(repo_name, pr_number, provider, github_token, **kwargs))
+
+
+def stream_pr(repo_name: str, pr_number: int, provider: str = "basic", github_token: Optional[str] = None, **kwargs) -> Iterator[str]:
+    """
+    Summarize a GitHub Pull Request, yielding the summary in chunks as it is generated.
+    
+    Takes the same arguments as summarize_pr. The PR is fetched and the provider
+    request started before this returns, so setup errors raise immediately rather
+    than from the first iteration.
+    """
     github_token = github_token or os.getenv("GITHUB_TOKEN")
     if not github_token:
         raise ValueError("GITHUB_TOKEN not found in environment or provided")
@@ -354,20 +955,33 @@ def summarize_pr(repo_name: str, pr_number: int, provider: str = "basic", github
     print(f"Fetching PR #{pr_number} from {repo_name}...")
     pr_data = get_pr_data(repo_name, pr_number, github_token)
     
+    # LLM output varies between runs, so only cache it when asked to
+    use_cache = provider not in ("openai", "ollama") or kwargs.get("cache", False)
+    cache_key = None
+    if use_cache:
+        cache_key = _summary_cache_key(repo_name, pr_number, provider, pr_data, kwargs)
+        cached = _load_summary(cache_key)
+        if cached is not None:
+            print("Using cached summary...")
+            return iter([cached])
+    
     # Generate summary
     if provider == "openai":
         print("Generating summary with OpenAI...")
-        return summarize_with_openai(pr_data, kwargs.get("api_key"))
+        # Deterministic output when it is going to be cached
+        chunks = stream_with_openai(pr_data, kwargs.get("api_key"), 0 if use_cache else 0.3)
     elif provider == "ollama":
         print("Generating summary with Ollama...")
-        return summarize_with_ollama(
+        chunks = stream_with_ollama(
             pr_data,
             kwargs.get("base_url", "http://localhost:11434"),
             kwargs.get("model", "llama2")
         )
     else:
         print("Generating basic summary...")
-        return summarize_with_basic(pr_data)
+        chunks = iter([summarize_with_basic(pr_data)])
+    
+    return _cache_completed(chunks, cache_key) if cache_key else chunks
 
 
 def main():
@@ -382,11 +996,13 @@ def main():
                        help="Ollama base URL (default: http://localhost:11434)")
     parser.add_argument("--ollama-model", default="llama2",
                        help="Ollama model name (default: llama2)")
+    parser.add_argument("--cache", action="store_true",
+                       help="Reuse cached OpenAI/Ollama summaries of unchanged PRs")
     
     args = parser.parse_args()
     
     try:
-        kwargs = {}
+        kwargs = {"cache": args.cache}
         if args.provider == "ollama":
             kwargs["base_url"] = args.ollama_url
             kwargs["model"] = args.ollama_model